@@ -4,32 +4,322 @@ Test client for the MCP Git Server
 Provides automated testing of server functionality
 """
 
+import io
 import json
 import socket
 import sys
 import time
-import argparse
-from typing import Dict, Any, Optional, List, Tuple
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+# asyncio, msgspec and fastjsonschema are slow to import and only needed by
+# some modes, so they are imported where they're used
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# JSON helpers: use orjson when available, falling back to the stdlib
+if orjson is not None:
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(data: Any) -> Any:
+        return orjson.loads(data)
+
+    def _json_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    def _json_loads(data: Any) -> Any:
+        if not isinstance(data, str):
+            data = str(data, 'utf-8')
+        return json.loads(data)
+
+    def _json_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+
+# Wire codecs keyed by format name: (dumps, loads); msgpack is added on first use
+_CODECS = {"json": (_json_dumps, _json_loads)}
+
+WIRE_FORMATS = ("json", "msgpack")
+
+_MSG_WAITALL = getattr(socket, "MSG_WAITALL", 0)
+
+
+def _get_codec(wire_format: str) -> Tuple[Any, Any]:
+    """
+    Look up the (dumps, loads) pair for a wire format
+    
+    Args:
+        wire_format: Serialization used on the wire ("json" or "msgpack")
+        
+    Returns:
+        Tuple of (dumps, loads) functions
+    """
+    if wire_format not in WIRE_FORMATS:
+        raise ValueError(f"Unknown wire format: {wire_format}")
+    
+    if wire_format not in _CODECS:
+        try:
+            import msgspec
+        except ImportError:
+            raise RuntimeError("msgpack wire format requires the 'msgspec' package") from None
+        # Reusable MessagePack codec
+        _CODECS["msgpack"] = (msgspec.msgpack.Encoder().encode, msgspec.msgpack.Decoder().decode)
+    return _CODECS[wire_format]
+
+
+# Standard test suite: (name, command, params, expected_status, validator)
+# where validator names an entry in _SUITE_SCHEMAS
+_SUITE_TESTS = (
+    ("Basic connectivity - Status", "status", None, "success", None),
+    ("Invalid command", "invalid_command", None, "error", None),
+    ("Get commit log (default)", "log", None, "success", "log"),
+    ("Get commit log with count", "log", {"count": 5}, "success", "log_count"),
+    ("List branches", "branch", None, "success", "branch"),
+    ("List remote branches", "remote", None, "success", "remote"),
+)
+
+# Response schemas for the standard test suite
+_SUITE_SCHEMAS = {
+    "log": {
+        "type": "object",
+        "required": ["data"],
+        "properties": {"data": {"type": "object", "properties": {"commits": {"type": "array"}}}}
+    },
+    "log_count": {
+        "type": "object",
+        "properties": {"data": {"type": "object", "properties": {"commits": {"type": "array", "maxItems": 5}}}}
+    },
+    "branch": {
+        "type": "object",
+        "required": ["data"],
+        "properties": {"data": {"type": "object", "properties": {"branches": {"type": "array"}}}}
+    },
+    "remote": {
+        "type": "object",
+        "required": ["data"],
+        "properties": {"data": {"type": "object", "properties": {"remotes": {"type": "array"}}}}
+    },
+}
+
+# Validators for the standard test suite, filled on first use
+_suite_validators: Dict[str, Callable[[Any], bool]] = {}
+
+# Equivalent checks used when fastjsonschema is not installed
+_SUITE_CHECKS = {
+    "log": lambda r: "data" in r and isinstance(r["data"].get("commits", []), list),
+    "log_count": lambda r: len(r.get("data", {}).get("commits", [])) <= 5,
+    "branch": lambda r: "data" in r and isinstance(r["data"].get("branches", []), list),
+    "remote": lambda r: "data" in r and isinstance(r["data"].get("remotes", []), list),
+}
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    Compile a JSON Schema into a validation function
+    
+    Requires the 'fastjsonschema' package.
+    
+    Args:
+        schema: JSON Schema fragment
+        
+    Returns:
+        Function returning True if a response matches the schema
+    """
+    try:
+        import fastjsonschema
+    except ImportError:
+        raise RuntimeError("Schema validation requires the 'fastjsonschema' package") from None
+    
+    validate = fastjsonschema.compile(schema)
+    
+    def check(value: Any) -> bool:
+        try:
+            validate(value)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+    
+    return check
+
+
+def _get_suite_validators() -> Dict[str, Callable[[Any], bool]]:
+    """
+    Get the validators for the standard test suite
+    
+    Compiles _SUITE_SCHEMAS when fastjsonschema is installed, otherwise uses
+    the plain checks in _SUITE_CHECKS.
+    
+    Returns:
+        Validation functions keyed by schema name
+    """
+    if not _suite_validators:
+        try:
+            for name, schema in _SUITE_SCHEMAS.items():
+                _suite_validators[name] = compile_schema(schema)
+        except RuntimeError:
+            _suite_validators.update(_SUITE_CHECKS)
+    return _suite_validators
+
+
+def _frame_key(command: str, params: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    """
+    Build a hashable cache key for a (command, params) pair
+    
+    Args:
+        command: Git command
+        params: Command parameters (dict)
+        
+    Returns:
+        Cache key, or None if the parameters can't be hashed
+    """
+    # Include value types so that e.g. 1, 1.0 and True don't share a frame
+    try:
+        key = (command, tuple((k, type(v), v) for k, v in sorted(params.items())) if params else ())
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+
+class StaleConnectionError(ConnectionResetError):
+    """Connection failed before the server sent any part of a reply"""
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytearray:
+    """
+    Receive exactly n bytes from a socket into a preallocated buffer
+    
+    Uses MSG_WAITALL so the common case is a single syscall; the loop covers
+    platforms or signals that still return short reads.
+    
+    Args:
+        sock: Connected socket
+        n: Number of bytes to read
+        
+    Returns:
+        Buffer holding the received bytes
+    """
+    buf = bytearray(n)
+    view = memoryview(buf)
+    offset = 0
+    while offset < n:
+        received = sock.recv_into(view[offset:], n - offset, _MSG_WAITALL)
+        if not received:
+            raise ConnectionResetError("Connection closed by server")
+        offset += received
+    return buf
 
 
 class MCPGitClient:
     """Client for interacting with the MCP Git Server"""
     
-    def __init__(self, host: str = "localhost", port: int = 9876):
+    def __init__(self, host: str = "localhost", port: int = 9876, wire_format: str = "json",
+                 batch: bool = False):
         """
         Initialize the MCP Git client
         
         Args:
             host: Server hostname
             port: Server port
+            wire_format: Serialization used on the wire ("json" or "msgpack")
+            batch: Use the server's batch command in send_batch()
         """
+        self._dumps, self._loads = _get_codec(wire_format)
         self.host = host
         self.port = port
+        self.wire_format = wire_format
+        self.batch = batch
+        self._sock = None
+    
+    def __enter__(self) -> "MCPGitClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _connect(self) -> socket.socket:
+        """
+        Open a new connection to the server with keep-alive enabled
+        
+        Returns:
+            Connected socket
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Linux-specific keep-alive tuning
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 5)
+            # Don't let Nagle hold back small request frames
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.connect((self.host, self.port))
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+    
+    def close(self) -> None:
+        """Close the cached server connection, if any"""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+    
+    def _exchange(self, frame: bytes) -> bytearray:
+        """
+        Send a framed request over the cached connection and read the reply
+        
+        Args:
+            frame: Length-prefixed request bytes
+            
+        Returns:
+            Raw response payload
+        """
+        if self._sock is None:
+            self._sock = self._connect()
+        client = self._sock
+        
+        try:
+            # Failing before any reply byte arrives means the server never
+            # read the request, so it is safe to resend
+            try:
+                client.sendall(frame)
+                response_len_bytes = bytearray(4)
+                received = client.recv_into(response_len_bytes, 4, _MSG_WAITALL)
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise StaleConnectionError(str(e)) from e
+            if not received:
+                raise StaleConnectionError("Connection closed by server")
+            
+            # Receive response length
+            if received < 4:
+                response_len_bytes[received:] = _recv_exact(client, 4 - received)
+            response_len = int.from_bytes(response_len_bytes, byteorder='big')
+            
+            # Receive response data
+            return _recv_exact(client, response_len)
+            
+        except BaseException:
+            # The stream may be out of sync; start fresh next time
+            self.close()
+            raise
     
     def send_command(self, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Send a command to the MCP Git Server
         
+        The connection is kept open and reused across calls.
+        
         Args:
             command: Git command to execute
             params: Command parameters (dict)
@@ -37,6 +327,22 @@ class MCPGitClient:
         Returns:
             Server response as a dictionary
         """
+        return self.send_raw(self.encode_command(command, params))
+    
+    def encode_command(self, command: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Serialize a single command into a length-prefixed frame
+        
+        The result can be cached and passed to send_raw() for requests whose
+        contents never change.
+        
+        Args:
+            command: Git command to execute
+            params: Command parameters (dict)
+            
+        Returns:
+            Framed request bytes
+        """
         if params is None:
             params = {}
             
@@ -46,81 +352,422 @@ class MCPGitClient:
             "params": params
         }
         
-        # Connect to server
-        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        return self._encode(request)
+    
+    def send_batch(self, cmds: List[Tuple[str, Optional[Dict[str, Any]]]],
+                   frame: Optional[bytes] = None,
+                   frames: Optional[List[Optional[bytes]]] = None) -> List[Dict[str, Any]]:
+        """
+        Send several independent commands, in a single round-trip if batching is enabled
+        
+        Without batching, or if the server does not understand the batch
+        command, each entry is sent on its own (and batching is disabled from
+        then on).
+        
+        Args:
+            cmds: List of (command, params) pairs
+            frame: Pre-encoded batch request for cmds, from encode_batch()
+            frames: Pre-encoded single requests for cmds, from encode_command();
+                None entries are encoded on demand
+            
+        Returns:
+            List of server responses, in the same order as cmds
+        """
+        if len(cmds) > 1 and self.batch:
+            ops = self._send_batch_request(cmds, frame)
+            if ops is not None:
+                return ops
+        
+        if frames is None:
+            frames = [None] * len(cmds)
+        return [self.send_raw(f) if f is not None else self.send_command(c, p)
+                for (c, p), f in zip(cmds, frames)]
+    
+    def _send_batch_request(self, cmds: List[Tuple[str, Optional[Dict[str, Any]]]],
+                            frame: Optional[bytes] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Send cmds as one batch request
         
+        Args:
+            cmds: List of (command, params) pairs
+            frame: Pre-encoded batch request for cmds, from encode_batch()
+            
+        Returns:
+            List of server responses, or None if the server rejected the batch
+        """
+        if frame is None:
+            frame = self.encode_batch(cmds)
+        
+        response = self.send_raw(frame)
+        ops = (response.get("data") or {}).get("ops") if response.get("status") == "success" else None
+        if isinstance(ops, list) and len(ops) == len(cmds):
+            return ops
+        
+        # Server doesn't support batching; don't ask again
+        self.batch = False
+        return None
+    
+    def encode_batch(self, cmds: List[Tuple[str, Optional[Dict[str, Any]]]]) -> bytes:
+        """
+        Serialize a batch request into a length-prefixed frame
+        
+        The result can be cached and passed to send_batch() for requests
+        whose contents never change.
+        
+        Args:
+            cmds: List of (command, params) pairs
+            
+        Returns:
+            Framed request bytes
+        """
+        request = {
+            "command": "batch",
+            "params": {
+                "ops": [{"command": c, "params": p or {}} for c, p in cmds]
+            }
+        }
+        return self._encode(request)
+    
+    def send_raw(self, frame: bytes) -> Dict[str, Any]:
+        """
+        Send an already framed request and decode the response
+        
+        Args:
+            frame: Length-prefixed request bytes
+            
+        Returns:
+            Server response as a dictionary
+        """
+        reused = self._sock is not None
         try:
-            client.connect((self.host, self.port))
+            response_data = self._exchange(frame)
+        except StaleConnectionError:
+            # A reused connection may have been dropped by the server; retry once
+            if not reused:
+                raise
+            response_data = self._exchange(frame)
             
-            # Serialize and send request
-            request_json = json.dumps(request).encode('utf-8')
-            length = len(request_json).to_bytes(4, byteorder='big')
-            client.sendall(length + request_json)
+        # Parse response straight from the receive buffer; the decoders copy
+        # what they need, so the result never aliases the buffer
+        response = self._loads(memoryview(response_data))
+        return response
+    
+    def _encode(self, request: Dict[str, Any]) -> bytes:
+        """
+        Serialize a request into a length-prefixed frame
+        
+        Args:
+            request: Request message
             
-            # Receive response length
-            response_len_bytes = client.recv(4)
-            response_len = int.from_bytes(response_len_bytes, byteorder='big')
+        Returns:
+            Framed request bytes
+        """
+        payload = self._dumps(request)
+        return len(payload).to_bytes(4, byteorder='big') + payload
+
+
+class AsyncMCPGitClient:
+    """Asyncio client that pipelines requests over a single connection"""
+    
+    def __init__(self, host: str = "localhost", port: int = 9876, wire_format: str = "json"):
+        """
+        Initialize the async MCP Git client
+        
+        Args:
+            host: Server hostname
+            port: Server port
+            wire_format: Serialization used on the wire ("json" or "msgpack")
+        """
+        self._dumps, self._loads = _get_codec(wire_format)
+        self.host = host
+        self.port = port
+        self.wire_format = wire_format
+        self._reader = None
+        self._writer = None
+        self._dispatcher = None
+        self._waiters = OrderedDict()
+        self._next_id = 0
+    
+    async def __aenter__(self) -> "AsyncMCPGitClient":
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    async def connect(self) -> None:
+        """Open the connection and start the response dispatcher"""
+        import asyncio
+        
+        if self._writer is not None:
+            return
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+    
+    async def close(self) -> None:
+        """Close the connection and fail any outstanding requests"""
+        import asyncio
+        
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._reader = self._writer = None
+        self._fail_waiters(ConnectionError("Connection closed"))
+    
+    async def send_command(self, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send a command without waiting for earlier requests to complete
+        
+        Each request carries an "id" that the server may echo back; responses
+        without an id are matched to requests in send order, and responses
+        with an unknown id are dropped.
+        
+        Args:
+            command: Git command to execute
+            params: Command parameters (dict)
             
-            # Receive response data
-            response_data = b""
-            while len(response_data) < response_len:
-                chunk = client.recv(min(4096, response_len - len(response_data)))
-                if not chunk:
-                    break
-                response_data += chunk
+        Returns:
+            Server response as a dictionary
+        """
+        import asyncio
+        
+        if params is None:
+            params = {}
+        if self._writer is None:
+            raise ConnectionError("Not connected")
+        if self._dispatcher.done():
+            # The server closed the connection or sent an unreadable response
+            raise ConnectionError("Connection closed")
+        
+        self._next_id += 1
+        request_id = self._next_id
+        request = {
+            "id": request_id,
+            "command": command,
+            "params": params
+        }
+        payload = self._dumps(request)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[request_id] = future
+        try:
+            self._writer.write(len(payload).to_bytes(4, byteorder='big') + payload)
+            await self._writer.drain()
+        except BaseException:
+            # Nobody will await the future, so don't leave it behind
+            self._waiters.pop(request_id, None)
+            if future.done():
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        return await future
+    
+    async def _dispatch(self) -> None:
+        """Read framed responses and resolve the matching requests"""
+        import asyncio
+        
+        try:
+            while True:
+                header = await self._reader.readexactly(4)
+                response_len = int.from_bytes(header, byteorder='big')
+                response = self._loads(await self._reader.readexactly(response_len))
                 
-            # Parse response
-            response = json.loads(response_data.decode('utf-8'))
-            return response
-            
-        finally:
-            client.close()
+                if isinstance(response, dict) and "id" in response:
+                    request_id = response["id"]
+                    future = self._waiters.pop(request_id, None) if isinstance(request_id, int) else None
+                    if future is None:
+                        # Not a request we're waiting for
+                        continue
+                else:
+                    if not self._waiters:
+                        continue
+                    # Server didn't echo the id; responses arrive in order
+                    _, future = self._waiters.popitem(last=False)
+                if not future.done():
+                    future.set_result(response)
+        except asyncio.IncompleteReadError:
+            self._fail_waiters(ConnectionResetError("Connection closed by server"))
+        except Exception as e:
+            self._fail_waiters(e)
+    
+    def _fail_waiters(self, error: Exception) -> None:
+        """Fail all outstanding requests with the given error"""
+        waiters, self._waiters = self._waiters, OrderedDict()
+        for future in waiters.values():
+            if not future.done():
+                future.set_exception(error)
 
 
 class MCPGitTester:
     """Test suite for the MCP Git Server"""
     
-    def __init__(self, client: MCPGitClient):
+    # Encoded requests for the standard suite, keyed by wire format:
+    # (batch request, {_frame_key(command, params): single request})
+    _suite_frames: Dict[str, Tuple[bytes, Dict[Tuple, bytes]]] = {}
+    
+    def __init__(self, client: MCPGitClient, quiet: bool = False):
         """
         Initialize the tester with a client
         
         Args:
             client: MCPGitClient instance
+            quiet: Only report the final results line
         """
         self.client = client
+        self.quiet = quiet
         self.tests_run = 0
         self.tests_passed = 0
+        self._pending = []
     
     def run_test(self, name: str, command: str, params: Optional[Dict[str, Any]] = None, 
                  expected_status: str = "success", validation_func: Optional[callable] = None) -> bool:
         """
         Run a single test against the server
         
+        Any previously queued tests are flushed in the same round-trip.
+        
+        Args:
+            name: Test name
+            command: Git command to execute
+            params: Command parameters
+            expected_status: Expected status in response ("success" or "error")
+            validation_func: Optional function to validate response data
+            
+        Returns:
+            True if test passed, False otherwise
+        """
+        self.queue_test(name, command, params, expected_status, validation_func)
+        return self.flush()[-1]
+    
+    def queue_test(self, name: str, command: str, params: Optional[Dict[str, Any]] = None, 
+                   expected_status: str = "success", validation_func: Optional[callable] = None) -> None:
+        """
+        Queue a test to be run on the next flush()
+        
         Args:
             name: Test name
             command: Git command to execute
             params: Command parameters
             expected_status: Expected status in response ("success" or "error")
             validation_func: Optional function to validate response data
+        """
+        self._pending.append((name, command, params, expected_status, validation_func))
+    
+    def flush(self, frame: Optional[bytes] = None) -> List[bool]:
+        """
+        Run all queued tests, as a single batch request if the client batches
+        
+        Args:
+            frame: Pre-encoded batch request for the queued tests
+            
+        Returns:
+            List of test results, in queue order
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        
+        # Reuse the cached frames for tests that are part of the standard suite
+        test_frames = self._get_suite_frames()[1]
+        frames = [test_frames.get(_frame_key(command, params)) for _, command, params, _, _ in pending]
+        
+        try:
+            responses = self.client.send_batch([(command, params) for _, command, params, _, _ in pending],
+                                               frame, frames)
+            error = None
+        except Exception as e:
+            responses = [None] * len(pending)
+            error = e
+        
+        return [self._check_result(test, response, error) for test, response in zip(pending, responses)]
+    
+    async def flush_async(self) -> List[bool]:
+        """
+        Run all queued tests concurrently, pipelined over one connection
+        
+        Tests that fail because the server dropped the connection are rerun
+        through the synchronous client.
+        
+        Returns:
+            List of test results, in queue order
+        """
+        import asyncio
+        
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        
+        client = AsyncMCPGitClient(self.client.host, self.client.port, self.client.wire_format)
+        try:
+            async with client:
+                results = await asyncio.gather(
+                    *(client.send_command(command, params) for _, command, params, _, _ in pending),
+                    return_exceptions=True
+                )
+        except Exception as e:
+            results = [e] * len(pending)
+        
+        # The server may close the connection after each reply; rerun the
+        # requests that lost their connection through the synchronous client
+        retry = [i for i, result in enumerate(results)
+                 if isinstance(result, ConnectionError) and not isinstance(result, ConnectionRefusedError)]
+        if retry:
+            try:
+                responses = self.client.send_batch([(pending[i][1], pending[i][2]) for i in retry])
+            except Exception as e:
+                responses = [e] * len(retry)
+            for i, response in zip(retry, responses):
+                results[i] = response
+        
+        return [self._check_result(test, None, result) if isinstance(result, Exception)
+                else self._check_result(test, result)
+                for test, result in zip(pending, results)]
+    
+    def _check_result(self, test: Tuple, response: Optional[Dict[str, Any]],
+                      error: Optional[Exception] = None) -> bool:
+        """
+        Report and score the response to a single test
+        
+        Args:
+            test: Queued test tuple
+            response: Server response (None if the request failed)
+            error: Exception raised while sending, if any
             
         Returns:
             True if test passed, False otherwise
         """
+        name, command, params, expected_status, validation_func = test
+        
+        # Collect output and write it once per test
+        buf = io.StringIO()
         self.tests_run += 1
-        print(f"\nTest {self.tests_run}: {name}")
-        print(f"  Command: {command}")
-        print(f"  Params: {params}")
+        buf.write(f"\nTest {self.tests_run}: {name}\n")
+        buf.write(f"  Command: {command}\n")
+        buf.write(f"  Params: {params}\n")
         
+        passed = False
         try:
-            response = self.client.send_command(command, params)
+            if error is not None:
+                raise error
             status = response.get("status")
             
             # Check status
             status_ok = status == expected_status
             if status_ok:
-                print(f"  ✓ Status: {status} (as expected)")
+                buf.write(f"  ✓ Status: {status} (as expected)\n")
             else:
-                print(f"  ✗ Status: {status} (expected {expected_status})")
+                buf.write(f"  ✗ Status: {status} (expected {expected_status})\n")
             
             # Run custom validation if provided
             validation_ok = True
@@ -129,69 +776,92 @@ class MCPGitTester:
             
             # Overall test result
             if status_ok and validation_ok:
-                print("  ✓ Test passed")
+                buf.write("  ✓ Test passed\n")
                 self.tests_passed += 1
-                return True
+                passed = True
             else:
-                print("  ✗ Test failed")
-                return False
+                buf.write("  ✗ Test failed\n")
                 
         except Exception as e:
-            print(f"  ✗ Exception: {str(e)}")
-            return False
+            buf.write(f"  ✗ Exception: {str(e)}\n")
+        
+        if not self.quiet:
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
+        return passed
     
     def run_test_suite(self) -> Tuple[int, int]:
         """
         Run the complete test suite
         
+        If the client batches, all tests are sent in a single request.
+        
         Returns:
             Tuple of (tests_passed, tests_run)
         """
-        # Test basic connectivity
-        self.run_test(
-            name="Basic connectivity - Status",
-            command="status"
-        )
-        
-        # Test invalid command
-        self.run_test(
-            name="Invalid command",
-            command="invalid_command",
-            expected_status="error"
-        )
-        
-        # Test log with default parameters
-        self.run_test(
-            name="Get commit log (default)",
-            command="log",
-            validation_func=lambda r: "data" in r and isinstance(r["data"].get("commits", []), list)
-        )
-        
-        # Test log with count parameter
-        self.run_test(
-            name="Get commit log with count",
-            command="log",
-            params={"count": 5},
-            validation_func=lambda r: len(r.get("data", {}).get("commits", [])) <= 5
-        )
-        
-        # Test branch list
-        self.run_test(
-            name="List branches",
-            command="branch",
-            validation_func=lambda r: "data" in r and isinstance(r["data"].get("branches", []), list)
-        )
-        
-        # Test remote branches
-        self.run_test(
-            name="List remote branches",
-            command="remote",
-            validation_func=lambda r: "data" in r and isinstance(r["data"].get("remotes", []), list)
-        )
-        
-        # Report results
-        print(f"\nTest Results: {self.tests_passed}/{self.tests_run} tests passed")
+        # Run anything queued earlier on its own so it can't leak into the cached frame
+        self.flush()
+        self._queue_suite()
+        
+        # The cached batch frame is only used if the client batches
+        self.flush(self._get_suite_frames()[0])
+        
+        return self._report()
+    
+    def _get_suite_frames(self) -> Tuple[bytes, Dict[Tuple, bytes]]:
+        """
+        Get the encoded suite requests for the client's wire format
+        
+        The suite's requests are constant, so they are encoded once per wire
+        format and shared by all testers.
+        
+        Returns:
+            Tuple of (batch request, single requests keyed by _frame_key)
+        """
+        frames = self._suite_frames.get(self.client.wire_format)
+        if frames is None:
+            cmds = [(command, params) for _, command, params, _, _ in _SUITE_TESTS]
+            frames = (
+                self.client.encode_batch(cmds),
+                {_frame_key(command, params): self.client.encode_command(command, params)
+                 for command, params in cmds}
+            )
+            self._suite_frames[self.client.wire_format] = frames
+        return frames
+    
+    async def run_test_suite_async(self) -> Tuple[int, int]:
+        """
+        Run the complete test suite, pipelining all tests concurrently
+        
+        Returns:
+            Tuple of (tests_passed, tests_run)
+        """
+        self._queue_suite()
+        await self.flush_async()
+        return self._report()
+    
+    def _report(self) -> Tuple[int, int]:
+        """
+        Print the suite summary
+        
+        Returns:
+            Tuple of (tests_passed, tests_run)
+        """
+        sys.stdout.write(f"\nTest Results: {self.tests_passed}/{self.tests_run} tests passed\n")
+        sys.stdout.flush()
         return (self.tests_passed, self.tests_run)
+    
+    def _queue_suite(self) -> None:
+        """Queue all tests in the standard suite"""
+        validators = _get_suite_validators()
+        for name, command, params, expected_status, validator in _SUITE_TESTS:
+            self.queue_test(
+                name=name,
+                command=command,
+                params=params,
+                expected_status=expected_status,
+                validation_func=validators[validator] if validator else None
+            )
 
 
 def interactive_mode(client: MCPGitClient):
@@ -216,7 +886,7 @@ def interactive_mode(client: MCPGitClient):
             params = {}
             if params_input.strip():
                 try:
-                    params = json.loads(params_input)
+                    params = _json_loads(params_input)
                 except json.JSONDecodeError:
                     print("Error: Invalid JSON parameters")
                     continue
@@ -224,7 +894,7 @@ def interactive_mode(client: MCPGitClient):
             # Execute command
             response = client.send_command(command, params)
             print("\nResponse:")
-            print(json.dumps(response, indent=2))
+            print(_json_pretty(response))
             
         except KeyboardInterrupt:
             break
@@ -232,49 +902,146 @@ def interactive_mode(client: MCPGitClient):
             print(f"Error: {str(e)}")
 
 
-def main():
-    """Main entry point for the MCP Git test client"""
+MODES = ("interactive", "test", "command")
+
+# CLI options: name -> (type, choices, default, help); bool options are flags.
+# Both _build_parser and _fast_parse are driven by this table
+_OPTIONS = {
+    "host": (str, None, "localhost", "Server hostname"),
+    "port": (int, None, 9876, "Server port"),
+    "mode": (str, MODES, "command", "Client mode: interactive, test suite, or single command"),
+    "format": (str, WIRE_FORMATS, "json", "Wire serialization format (msgpack requires msgspec)"),
+    "batch": (bool, None, False,
+              "In test mode, send the suite as one batch request (server must support it)"),
+    "pipeline": (bool, None, False,
+                 "In test mode, pipeline tests concurrently over asyncio"),
+    "quiet": (bool, None, False, "In test mode, only print the final results line"),
+}
+
+
+def _build_parser():
+    """
+    Build the full argparse parser (imported lazily to keep startup fast)
+    
+    Returns:
+        ArgumentParser for the client CLI
+    """
+    import argparse
+    
     parser = argparse.ArgumentParser(description="MCP Git Server Test Client")
-    parser.add_argument("--host", default="localhost", help="Server hostname")
-    parser.add_argument("--port", type=int, default=9876, help="Server port")
-    parser.add_argument("--mode", choices=["interactive", "test", "command"], default="command", 
-                        help="Client mode: interactive, test suite, or single command")
+    for name, (option_type, choices, default, help_text) in _OPTIONS.items():
+        if option_type is bool:
+            parser.add_argument(f"--{name}", action="store_true", help=help_text)
+        else:
+            parser.add_argument(f"--{name}", type=option_type, choices=choices, default=default,
+                                help=help_text)
     parser.add_argument("command", nargs="?", help="Git command to execute (in command mode)")
     parser.add_argument("params", nargs="?", help="Command parameters as JSON (in command mode)")
+    return parser
+
+
+def _fast_parse(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common command lines without importing argparse
     
-    args = parser.parse_args()
+    Args:
+        argv: Command line arguments (without the program name)
+        
+    Returns:
+        Parsed arguments, or None if argparse should handle the command line
+        (help, unknown options or invalid values)
+    """
+    args = SimpleNamespace(command=None, params=None,
+                           **{name: option[2] for name, option in _OPTIONS.items()})
+    positionals = []
+    # argparse fills both positionals from the first run of them
+    positionals_done = False
+    
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+        
+        if not arg.startswith("-") or arg == "-":
+            if positionals_done:
+                return None
+            positionals.append(arg)
+            continue
+        positionals_done = bool(positionals)
+        
+        name, sep, value = arg[2:].partition("=") if arg.startswith("--") else ("", "", "")
+        option = _OPTIONS.get(name)
+        if option is None:
+            return None
+        option_type, choices, _, _ = option
+        
+        if option_type is bool:
+            if sep:
+                return None
+            setattr(args, name, True)
+            continue
+        
+        if not sep:
+            if i >= len(argv) or argv[i].startswith("-"):
+                return None
+            value = argv[i]
+            i += 1
+        
+        try:
+            value = option_type(value)
+        except ValueError:
+            return None
+        if choices is not None and value not in choices:
+            return None
+        setattr(args, name, value)
     
-    # Create client
-    client = MCPGitClient(args.host, args.port)
+    if len(positionals) > 2:
+        return None
+    positionals += [None] * (2 - len(positionals))
+    args.command, args.params = positionals
+    return args
+
+
+def main():
+    """Main entry point for the MCP Git test client"""
+    args = _fast_parse(sys.argv[1:])
+    if args is None:
+        args = _build_parser().parse_args()
     
     try:
-        if args.mode == "interactive":
-            # Run interactive mode
-            interactive_mode(client)
-            
-        elif args.mode == "test":
-            # Run test suite
-            tester = MCPGitTester(client)
-            tester.run_test_suite()
-            
-        else:  # command mode
-            # Check for required command
-            if not args.command:
-                parser.print_help()
-                sys.exit(1)
+        # Create client
+        with MCPGitClient(args.host, args.port, args.format, args.batch) as client:
+            if args.mode == "interactive":
+                # Run interactive mode
+                interactive_mode(client)
                 
-            # Parse parameters if provided
-            params = {}
-            if args.params:
-                try:
-                    params = json.loads(args.params)
-                except json.JSONDecodeError:
-                    print("Error: Invalid JSON parameters")
+            elif args.mode == "test":
+                # Run test suite
+                tester = MCPGitTester(client, quiet=args.quiet)
+                if args.pipeline:
+                    import asyncio
+                    asyncio.run(tester.run_test_suite_async())
+                else:
+                    tester.run_test_suite()
+                
+            else:  # command mode
+                # Check for required command
+                if not args.command:
+                    _build_parser().print_help()
                     sys.exit(1)
-            
-            # Execute command
-            response = client.send_command(args.command, params)
-            print(json.dumps(response, indent=2))
+                    
+                # Parse parameters if provided
+                params = {}
+                if args.params:
+                    try:
+                        params = _json_loads(args.params)
+                    except json.JSONDecodeError:
+                        print("Error: Invalid JSON parameters")
+                        sys.exit(1)
+                
+                # Execute command
+                response = client.send_command(args.command, params)
+                print(_json_pretty(response))
             
     except ConnectionRefusedError:
         print("Error: Could not connect to the server")